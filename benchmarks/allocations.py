@@ -0,0 +1,121 @@
+"""
+Memory benchmark for the round engine.
+
+Plays full games between `HeuristicPlayer`s under tracemalloc
+and reports the peak memory allocated while playing a game,
+along with the footprint of the objects a round is built from.
+
+--compare plays the same games again with a baseline engine
+that builds a new Trick and playing order for every trick, as
+the engine did before reusing them, so the effect of reuse
+can be measured on its own.
+
+    python benchmarks/allocations.py [--games 200] [--seed 0] [--compare]
+"""
+import argparse
+from itertools import cycle
+import random
+import sys
+import time
+import tracemalloc
+
+from contract_whist.cards import Card, Deck, Values, SUITS
+from contract_whist.game import Game
+from contract_whist.hand import Hand
+from contract_whist.players import HeuristicPlayer, Player
+from contract_whist.trick import Trick
+
+
+def footprint(obj: object) -> int:
+    """
+    Size of an instance, including its __dict__ if it has one
+    """
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+class BaselineGame(Game):
+    """
+    Game with a fresh Trick and rotated player list per trick
+    """
+
+    def play_hands(self, hands: list[Hand]) -> dict[Player, int]:
+        num_tricks = len(hands[0])
+        contracts = self.get_bids(hands)
+        tricks: dict[Player, int] = {player: 0 for player in self.players}
+
+        leader_index = 0
+        for _ in range(num_tricks):
+            trick = Trick()
+            for player in self.players[leader_index:] + self.players[:leader_index]:
+                trick.add_card(player, player.play_card(trick))
+
+            winner = trick.resolve()
+            for player in self.players:
+                player.update_trick_result(trick)
+            leader_index = self.players.index(winner)
+            tricks[winner] += 1
+
+        return {
+            player: score + self.CONTRACT_BONUS if score == contracts[player] else score
+            for player, score in tricks.items()
+        }
+
+
+def play_games(
+    num_games: int, seed: int, game_class: type[Game] = Game
+) -> tuple[list[int], float]:
+    """
+    Returns the peak bytes traced while playing each game and
+    the total time taken
+    """
+    random.seed(seed)
+    peaks = []
+    start = time.perf_counter()
+    for _ in range(num_games):
+        game = game_class([HeuristicPlayer(name, 1.05, 0.35, 6) for name in "ABCD"])
+        game.DECK, game.SUIT_ORDER = Deck(), cycle(SUITS + (None,))
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        game.play_game(game.hands)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    return peaks, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--compare", action="store_true", help="also run the per-trick baseline"
+    )
+    args = parser.parse_args()
+
+    engines = [("current", Game)]
+    if args.compare:
+        engines.append(("baseline", BaselineGame))
+
+    print(f"games played:          {args.games}")
+    for label, game_class in engines:
+        play_games(1, args.seed, game_class)  # warm up caches outside the trace
+        tracemalloc.start()
+        peaks, elapsed = play_games(args.games, args.seed, game_class)
+        tracemalloc.stop()
+        print(f"{label}:")
+        print(f"  mean peak per game:    {sum(peaks) / len(peaks) / 1024:8.1f} KiB")
+        print(f"  max peak per game:     {max(peaks) / 1024:8.1f} KiB")
+        print(f"  time per game (traced): {elapsed / args.games * 1000:7.2f} ms")
+    card = Card(SUITS[0], Values.ace)
+    for name, obj in (
+        ("Card", card),
+        ("Hand (1 card)", Hand([card])),
+        ("Trick", Trick()),
+        ("HeuristicPlayer", HeuristicPlayer("A", 1.05, 0.35, 6)),
+    ):
+        print(f"{name + ' bytes:':23s} {footprint(obj):5d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Startup time benchmark for the modules a plain game or a
+short lived worker process imports.
+
+Each module is imported in a fresh interpreter with
+`python -X importtime`, keeping the fastest of a few runs.
+Fails if a module goes over its budget or pulls in one of
+the heavy optional dependencies.
+
+    python benchmarks/import_time.py [--budget-ms 50] [--repeats 5]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODULES = (
+    "contract_whist.game",
+    "contract_whist.players",
+    "contract_whist.inference",
+    "contract_whist.analysis",
+    "contract_whist.league",
+    "contract_whist.distributed",
+)
+HEAVY = ("numpy", "matplotlib", "torch", "tqdm")
+
+
+def import_time(module: str) -> tuple[float, set[str]]:
+    """
+    Import `module` in a new interpreter, returning the
+    cumulative import time in ms and every module imported
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative, imported = 0.0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        if not total.strip().isdigit():
+            continue  # header row
+        imported.add(name.strip())
+        if name.strip() == module:
+            cumulative = int(total) / 1000
+    return cumulative, imported
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        runs = [import_time(module) for _ in range(args.repeats)]
+        best = min(cumulative for cumulative, _ in runs)
+        heavy = sorted(
+            name
+            for name in runs[0][1]
+            if name.split(".")[0] in HEAVY
+            and "." not in name  # report top level packages only
+        )
+        ok = best <= args.budget_ms and not heavy
+        failed |= not ok
+        print(
+            f"{module:30s} | {best:7.2f} ms"
+            + (f" | imports {', '.join(heavy)}" if heavy else "")
+            + ("" if ok else "  <- FAIL")
+        )
+    print(f"budget: {args.budget_ms:.0f} ms per module")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,266 @@
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+import logging
+import random
+import threading
+from typing import TYPE_CHECKING
+
+from contract_whist.cards import Card
+from contract_whist.hand import Hand
+from contract_whist.inference import HandInference
+from contract_whist.trick import Trick
+from contract_whist.players.heuristic_player import HeuristicPlayer
+
+if TYPE_CHECKING:
+    from contract_whist.players import Player
+
+THREAD_PREFIX = "analysis"
+
+# (player, card) pairs in laying order
+Played = list[tuple["Player", Card]]
+# cards each player holds, the player's own hand included
+Holdings = dict["Player", list[Card]]
+
+
+def _not_analysis(record: logging.LogRecord) -> bool:
+    # Simulated tricks would otherwise flood the game log
+    return not record.threadName.startswith(THREAD_PREFIX)
+
+
+class Analyst:
+    """
+    Estimates, for each card a player could lay, the chance of
+    them making their contract.
+
+    Hidden hands are sampled from what the player has seen with
+    `HandInference`, then the rest of the round is played out by
+    `HeuristicPlayer`s, trying every playable card on each deal.
+    Simulations run on a thread pool and the tallies grow as they
+    finish, so asking again gives a better estimate.
+
+    Once a trick is over, deals for the next one are sampled
+    while the opponents ahead of the player lay their cards, with
+    those cards simulated too. When the player's turn comes, deals
+    whose simulated cards match the ones laid already have their
+    results, other deals the laid cards are consistent with are
+    played out from the real trick, and the rest are dropped.
+
+    Only public information about opponents is used: their
+    bids, tricks won and the cards they have laid.
+    """
+
+    def __init__(
+        self,
+        player: Player,
+        players: list[Player],
+        bidder: tuple[float, float, int] = (1.05, 0.35, 6),
+        workers: int = 2,
+        max_samples: int = 2000,
+    ):
+        self.player = player
+        self.players = players  # seating order, any rotation
+        self.bidder = bidder
+        self.workers = workers
+        self.max_samples = max_samples
+
+        self.inference: HandInference | None = None
+        self.tricks_won: dict[Player, int] = {}
+        # deals for the next trick: (holdings, simulated cards before ours, results)
+        self.prepared: list[tuple[Holdings, Played, dict[Card, bool]]] = []
+        self.prepared_state: tuple | None = None
+        self.queue: deque[Holdings] = deque()
+        self.current: dict[Card, list[int]] = {}
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.futures: list[Future] = []
+        self.pool = ThreadPoolExecutor(workers, thread_name_prefix=THREAD_PREFIX)
+        logging.getLogger().addFilter(_not_analysis)
+
+    def new_round(self) -> None:
+        self.stop()
+        opponents = [player for player in self.players if player is not self.player]
+        self.inference = HandInference(self.player.hand, opponents, len(self.players))
+        self.tricks_won = {player: 0 for player in self.players}
+        self.prepared = []
+
+    def observe(self, trick: Trick) -> None:
+        """
+        Record a finished trick and start on the next one
+        """
+        self.inference.observe_trick(trick)
+        self.tricks_won[trick.winner] += 1
+        if not len(self.player.hand):
+            return
+        self.prepared = []
+        self.prepared_state = self._state(self.tricks_won)
+        self._submit(self._prepare, self.player.hand.cards[:], trick.winner)
+
+    def start(self, trick: Trick) -> None:
+        """
+        Start analysing the player's options in `trick`
+        """
+        self.stop()
+        self.inference.observe_trick(trick)
+        # copied so the game can carry on with its own trick
+        played = list(zip(trick.players, trick.cards))
+        counts = {player: player.trick_count for player in self.players}
+        reuse = self.prepared_state == self._state(counts)
+
+        self.current = {card: [0, 0] for card in self.player.hand.playable(trick)}
+        self.queue = deque()
+        laid = set(trick.cards)
+        for holdings, simulated, results in self.prepared:
+            if reuse and simulated == played:
+                self._add(results)
+            elif self._consistent(holdings, played, trick.lead_suit):
+                self.queue.append(
+                    {
+                        player: [card for card in cards if card not in laid]
+                        for player, cards in holdings.items()
+                    }
+                )
+        self.prepared = []
+        self._submit(self._run, self.player.hand.cards[:], played, counts)
+
+    def stop(self) -> None:
+        """
+        Stop the simulations, waiting for the current ones so
+        nothing is still sampling when the next trick is seen
+        """
+        self.stopping.set()
+        wait(self.futures)
+        self.futures = []
+
+    def estimates(self) -> dict[Card, tuple[float, int]]:
+        """
+        The chance of making the contract after laying each
+        card, with the number of simulations behind it
+        """
+        with self.lock:
+            return {
+                card: (made / total if total else 0.0, total)
+                for card, (made, total) in self.current.items()
+            }
+
+    def _submit(self, task, *args) -> None:
+        self.stopping.clear()
+        self.futures = [
+            self.pool.submit(task, random.Random(), *args) for _ in range(self.workers)
+        ]
+
+    def _state(self, counts: dict[Player, int]) -> tuple:
+        # everything the simulated players' choices depend on besides their cards
+        return tuple((player.contract, counts[player]) for player in self.players)
+
+    def _add(self, results: dict[Card, bool]) -> None:
+        with self.lock:
+            for card, made in results.items():
+                self.current[card][0] += made
+                self.current[card][1] += 1
+
+    @staticmethod
+    def _consistent(holdings: Holdings, played: Played, lead_suit: str | None) -> bool:
+        """
+        Whether a deal sampled at the start of the trick could
+        have led to the cards laid so far
+        """
+        for player, card in played:
+            cards = holdings[player]
+            if card not in cards:
+                return False
+            if card.suit != lead_suit and any(held.suit == lead_suit for held in cards):
+                return False
+        return True
+
+    def _prepare(self, rng: random.Random, hand: list[Card], leader: Player) -> None:
+        """
+        Sample deals for the next trick, playing the opponents
+        ahead of the player and then each card the player could
+        follow with
+        """
+        counts = dict(self.tricks_won)
+        index = self.players.index(leader)
+        order = self.players[index:] + self.players[:index]
+        ahead = order[: order.index(self.player)]
+        while not self.stopping.is_set():
+            with self.lock:
+                if len(self.prepared) >= self.max_samples:
+                    return
+            holdings = self.inference.sample(rng)
+            holdings[self.player] = hand
+
+            sims = self._seat(holdings, counts)
+            trick = Trick()
+            for player in ahead:
+                trick.add_card(sims[player], sims[player].play_card(trick))
+            played = list(zip(ahead, trick.cards))
+            hands = {player: sim.hand.cards[:] for player, sim in sims.items()}
+            results = {
+                card: self._play_out(hands, played, card, counts)
+                for card in sims[self.player].hand.playable(trick)
+            }
+            with self.lock:
+                self.prepared.append((holdings, played, results))
+
+    def _run(
+        self,
+        rng: random.Random,
+        hand: list[Card],
+        played: Played,
+        counts: dict[Player, int],
+    ) -> None:
+        while not self.stopping.is_set():
+            with self.lock:
+                if next(iter(self.current.values()))[1] >= self.max_samples:
+                    return
+                hands = self.queue.popleft() if self.queue else None
+            if hands is None:
+                hands = self.inference.sample(rng)
+                hands[self.player] = hand
+            self._add(
+                {
+                    card: self._play_out(hands, played, card, counts)
+                    for card in self.current
+                }
+            )
+
+    def _seat(
+        self, hands: Holdings, counts: dict[Player, int]
+    ) -> dict[Player, HeuristicPlayer]:
+        sims = {}
+        for player in self.players:
+            sim = HeuristicPlayer(player.name, *self.bidder)
+            sim.hand = Hand(hands[player][:])
+            sim.contract, sim.trick_count = player.contract, counts[player]
+            sims[player] = sim
+        return sims
+
+    def _play_out(
+        self, hands: Holdings, played: Played, card: Card, counts: dict[Player, int]
+    ) -> bool:
+        """
+        Play out the rest of the round from one deal of the
+        cards still held after laying `card`, returning whether
+        the contract was made
+        """
+        sims = self._seat(hands, counts)
+        trick = Trick()
+        for player, laid in played:
+            trick.add_card(sims[player], laid)
+        me = sims[self.player]
+        trick.add_card(me, me.hand.play_card(card))
+
+        # seats in playing order from whoever led this trick
+        leader = self.players.index(played[0][0] if played else self.player)
+        order = [sims[player] for player in self.players[leader:] + self.players[:leader]]
+        while True:
+            for sim in order[len(trick):]:
+                trick.add_card(sim, sim.play_card(trick))
+            winner = trick.players[trick.cards.index(trick.winning_card(trick.cards))]
+            winner.trick_count += 1
+            if not len(me.hand):
+                return me.trick_count == me.contract
+            leader = order.index(winner)
+            order = order[leader:] + order[:leader]
+            trick.reset()
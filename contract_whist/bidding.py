@@ -0,0 +1,128 @@
+import numpy as np
+
+from contract_whist.cards import Deck, SUITS
+from contract_whist.hand import Hand
+
+# Suit and face value of each card, looked up by `Card.index`
+_CARDS = sorted(Deck(), key=lambda card: card.index)
+CARD_SUITS = np.array([SUITS.index(card.suit) for card in _CARDS])
+CARD_VALUES = np.array([int(card.value) for card in _CARDS])
+
+
+def deal(
+    num_deals: int,
+    num_cards: int,
+    num_players: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Shuffle and deal `num_deals` tables at once, a card at a
+    time to each player in turn like `Deck.shuffle_and_deal`.
+
+    Returns the card indices with shape
+    (num_deals, num_players, num_cards)
+    """
+    total_cards = num_cards * num_players
+    if not (num_cards > 0 and num_players > 0 and total_cards <= len(_CARDS)):
+        raise ValueError(f"can't deal {num_cards} cards to {num_players} players")
+    rng = np.random.default_rng() if rng is None else rng
+    decks = np.broadcast_to(np.arange(len(_CARDS)), (num_deals, len(_CARDS)))
+    shuffled = rng.permuted(decks, axis=1)
+    return (
+        shuffled[:, :total_cards]
+        .reshape(num_deals, num_cards, num_players)
+        .transpose(0, 2, 1)
+    )
+
+
+def hands_to_array(hands: list[Hand]) -> np.ndarray:
+    """
+    Convert one table of dealt `Hand`s into the card index
+    array used here, shape (num_players, num_cards)
+    """
+    return np.array([[card.index for card in hand] for hand in hands])
+
+
+def evaluate_hands(
+    cards: np.ndarray,
+    trump: str | None,
+    trump_multiplier: float,
+    card_multiplier: float,
+    card_cutoff: int,
+) -> np.ndarray:
+    """
+    Vectorised `HeuristicPlayer.evaluate_hand` over every hand
+    in `cards`, reducing over the last (card) axis.
+
+    The sum is taken in a different order to the player's, so a
+    score landing exactly on a half may round the other way.
+    """
+    values = CARD_VALUES[cards]
+    is_trump = CARD_SUITS[cards] == (-1 if trump is None else SUITS.index(trump))
+    weights = np.where(
+        is_trump,
+        trump_multiplier,
+        np.where(values > card_cutoff, card_multiplier, 0.0),
+    )
+    return (weights * values).sum(axis=-1) / 10
+
+
+def heuristic_bids(scores: np.ndarray, num_cards: int) -> np.ndarray:
+    """
+    Round hand evaluations of shape (num_deals, num_players)
+    to bids as `HeuristicPlayer.make_bid` would, with the
+    last player in each row dealing.
+    """
+    bids = np.clip(np.round(scores), 0, num_cards).astype(int)
+    forbidden = num_cards - bids[:, :-1].sum(axis=1)
+    dealer_score, dealer_bid = scores[:, -1], bids[:, -1]
+    clash = dealer_bid == forbidden
+    # Closest remaining option, ties go to the lower bid
+    go_up = (forbidden == 0) | (
+        (dealer_score > forbidden) & (forbidden < num_cards)
+    )
+    dealer_bid[clash] = np.where(go_up, forbidden + 1, forbidden - 1)[clash]
+    return bids
+
+
+def random_bids(
+    num_deals: int,
+    num_players: int,
+    num_cards: int,
+    rng: np.random.Generator | None = None,
+) -> np.ndarray:
+    """
+    Uniformly random bids like `RandomPlayer.make_bid`, with the
+    dealer drawing from the options left by the others.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    bids = rng.integers(0, num_cards + 1, size=(num_deals, num_players))
+    forbidden = num_cards - bids[:, :-1].sum(axis=1)
+    restricted = forbidden >= 0
+    # Draw from one fewer option and step over the forbidden bid
+    dealer_bid = rng.integers(0, num_cards + 1 - restricted)
+    dealer_bid[restricted & (dealer_bid >= forbidden)] += 1
+    bids[:, -1] = dealer_bid
+    return bids
+
+
+def bid_round(
+    num_deals: int,
+    num_cards: int,
+    num_players: int,
+    trump: str | None,
+    trump_multiplier: float,
+    card_multiplier: float,
+    card_cutoff: int,
+    rng: np.random.Generator | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Deal `num_deals` tables of heuristic bidders in one pass.
+
+    Returns the dealt card indices and the bids.
+    """
+    cards = deal(num_deals, num_cards, num_players, rng)
+    scores = evaluate_hands(
+        cards, trump, trump_multiplier, card_multiplier, card_cutoff
+    )
+    return cards, heuristic_bids(scores, num_cards)
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class LRUCache:
+    """
+    A bounded cache that drops the least recently used entry
+    once full, counting hits and misses as it goes.
+
+    Meant for expensive evaluations keyed by
+    `Hand.canonical_key`, so a hand pattern seen before is
+    answered without recomputing it.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive not {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Return the cached value for `key`, calling `compute`
+        to fill it in on a miss
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            value = self._entries[key] = compute()
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return (
+            f"LRUCache({len(self)}/{self.maxsize} entries, "
+            f"{self.hits} hits, {self.misses} misses, "
+            f"hit rate {self.hit_rate:.1%})"
+        )
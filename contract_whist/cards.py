@@ -1,5 +1,5 @@
 from enum import IntEnum
-from random import shuffle
+from random import Random, shuffle
 from itertools import count
 
 Values = IntEnum(
@@ -13,6 +13,8 @@ class Card:
     Each card is a singleton
     """
 
+    __slots__ = ("suit", "value", "index")
+
     TRUMP: str | None = None
     _instances: dict[tuple[str, IntEnum], "Card"] = {}
     _index_counter = count()
@@ -63,10 +65,13 @@ class Deck:
     def __len__(self):
         return len(self.cards)
 
-    def shuffle_and_deal(self, num_cards: int, num_players: int) -> list[list[Card]]:
+    def shuffle_and_deal(
+        self, num_cards: int, num_players: int, rng: Random | None = None
+    ) -> list[list[Card]]:
         total_cards = num_cards * num_players
         if num_cards > 0 and num_players > 0 and total_cards <= len(self.cards):
-            shuffle(self.cards)  # in place
+            # in place, with the global generator unless given one
+            (shuffle if rng is None else rng.shuffle)(self.cards)
             return [
                 [self.cards[i] for i in range(j, total_cards, num_players)]
                 for j in range(num_players)
@@ -0,0 +1,213 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, combinations_with_replacement, product
+import random
+from typing import Iterator
+
+import numpy as np
+import tqdm
+
+from contract_whist.cards import Card, Deck, SUITS, Values
+from contract_whist.game import Game
+from contract_whist.hand import Hand
+from contract_whist.players import HeuristicPlayer
+
+MASK_64 = (1 << 64) - 1
+SUIT_BITS = len(Values)
+
+
+def encode(key: tuple) -> int:
+    """
+    Pack a `Hand.canonical_key` into an integer, 13 bits per
+    suit under a marker for trumps or no trumps. Never 0, which
+    marks an empty slot in the table.
+    """
+    trump, others = key
+    code = 1 if trump is None else 2
+    for values in others if trump is None else (trump,) + others:
+        mask = 0
+        for value in values:
+            mask |= 1 << (value - 2)
+        code = code << SUIT_BITS | mask
+    return code
+
+
+def canonical_hands(num_cards: int, trumps: bool) -> Iterator[tuple]:
+    """
+    Every distinct `Hand.canonical_key` of `num_cards` cards,
+    with trumps or without
+    """
+    subsets = [
+        list(combinations(range(2, 2 + len(Values)), size))
+        for size in range(num_cards + 1)
+    ]
+    for num_trumps in range(num_cards + 1 if trumps else 1):
+        for trump in subsets[num_trumps] if trumps else [None]:
+            num_suits = len(SUITS) - 1 if trumps else len(SUITS)
+            for sizes in _partitions(num_cards - num_trumps, num_suits):
+                # suits of the same length are interchangeable
+                groups = [
+                    combinations_with_replacement(subsets[size], repeats)
+                    for size, repeats in Counter(sizes).items()
+                ]
+                for choice in product(*groups):
+                    others = [suit for group in choice for suit in group]
+                    yield trump, tuple(sorted(others, reverse=True))
+
+
+def _partitions(total: int, parts: int, largest: int | None = None) -> Iterator[tuple]:
+    """
+    Ways of writing `total` as `parts` non-increasing parts, zeros allowed
+    """
+    largest = total if largest is None else largest
+    if parts == 0:
+        if total == 0:
+            yield ()
+        return
+    for first in range(min(total, largest), -1, -1):
+        for rest in _partitions(total - first, parts - 1, first):
+            yield (first,) + rest
+
+
+def key_cards(key: tuple) -> tuple[list[Card], str | None]:
+    """
+    A hand with the canonical key, returned with its trump suit
+    """
+    trump, others = key
+    suits = SUITS if trump is None else SUITS[1:]
+    cards = [
+        Card(suit, Values(value))
+        for suit, values in zip(suits, others)
+        for value in values
+    ]
+    if trump is None:
+        return cards, None
+    return cards + [Card(SUITS[0], Values(value)) for value in trump], SUITS[0]
+
+
+def expected_tricks(
+    keys: list[tuple],
+    num_players: int,
+    samples: int,
+    bidder: tuple[float, float, int],
+    seed: int,
+) -> np.ndarray:
+    """
+    Monte Carlo estimate of the tricks taken by each hand in
+    every seat, with `HeuristicPlayer`s at all the seats and
+    the rest of the deck dealt at random.
+
+    Returns shape (len(keys), num_players)
+    """
+    rng = random.Random(seed)
+    deck = Deck()
+    # one table reused for every sample, reset between rounds
+    players = [HeuristicPlayer(str(i), *bidder) for i in range(num_players)]
+    game = Game(players)
+    tricks = np.zeros((len(keys), num_players), dtype=np.float32)
+    for row, key in enumerate(keys):
+        cards, trump = key_cards(key)
+        Card.set_trump(trump)
+        rest = [card for card in deck if card not in cards]
+        for seat in range(num_players):
+            total = 0
+            for _ in range(samples):
+                rng.shuffle(rest)
+                hands = [
+                    rest[i * len(cards) : (i + 1) * len(cards)]
+                    for i in range(num_players - 1)
+                ]
+                hands.insert(seat, cards)
+                game.play_hands([Hand(hand) for hand in hands])
+                total += players[seat].trick_count
+                for player in players:
+                    player.round_reset()
+            tricks[row, seat] = total / samples
+    return tricks
+
+
+def build_table(
+    path: str,
+    max_cards: int = 5,
+    num_players: int = 4,
+    samples: int = 32,
+    bidder: tuple[float, float, int] = (1.05, 0.35, 6),
+    workers: int | None = None,
+    chunk_size: int = 256,
+) -> None:
+    """
+    Estimate the expected tricks for every canonical hand of up
+    to `max_cards` cards, with and without trumps, in every seat,
+    spread over a process pool. Saved as a hash table of
+    (key, tricks per seat) records that `BidTable` memory maps.
+    """
+    keys = [
+        key
+        for num_cards in range(1, max_cards + 1)
+        for trumps in (True, False)
+        for key in canonical_hands(num_cards, trumps)
+    ]
+    chunks = [keys[i : i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(expected_tricks, chunk, num_players, samples, bidder, seed)
+            for seed, chunk in enumerate(chunks)
+        ]
+        tricks = np.concatenate([future.result() for future in tqdm.tqdm(futures)])
+
+    bits = max(1, (2 * len(keys) - 1).bit_length())  # at most half full
+    table = np.zeros(
+        1 << bits, dtype=[("key", "<u8"), ("tricks", "<f4", (num_players,))]
+    )
+    for key, row in zip(keys, tricks):
+        code = encode(key)
+        slot = _slot(code, bits)
+        while table["key"][slot]:
+            slot = (slot + 1) & (len(table) - 1)
+        table[slot] = code, row
+    np.save(path, table)
+
+
+def _slot(code: int, bits: int) -> int:
+    # Fibonacci hashing into a power of two sized table
+    return ((code * 0x9E3779B97F4A7C15) & MASK_64) >> (64 - bits)
+
+
+class BidTable:
+    """
+    Read only access to a table made by `build_table`, memory
+    mapped so only the pages looked at are loaded.
+    """
+
+    def __init__(self, path: str):
+        table = np.load(path, mmap_mode="r")
+        self.keys, self.tricks = table["key"], table["tricks"]
+        self.bits = len(table).bit_length() - 1
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.keys))
+
+    @property
+    def num_players(self) -> int:
+        return self.tricks.shape[1]
+
+    def lookup(
+        self, hand: Hand, trump: str | None, seat: int, num_players: int
+    ) -> float | None:
+        """
+        Expected tricks for the hand bid from `seat` at a table
+        of `num_players`, or None if the table doesn't cover it.
+        """
+        if num_players != self.num_players:
+            return None
+        code = encode(hand.canonical_key(trump))
+        slot = _slot(code, self.bits)
+        while stored := int(self.keys[slot]):
+            if stored == code:
+                return float(self.tricks[slot, seat])
+            slot = (slot + 1) & (len(self.keys) - 1)
+        return None
+
+
+if __name__ == "__main__":
+    build_table("bid_table.npy")
@@ -0,0 +1,183 @@
+import random
+
+import numpy as np
+
+from contract_whist.cards import Card, Deck, SUITS
+from contract_whist.game import Game
+from contract_whist.hand import Hand
+from contract_whist.trick import Trick
+from contract_whist.players import HeuristicPlayer
+from contract_whist.data.vector import GameStateVector
+
+# Cards looked up by `Card.index`, the action space
+CARDS = tuple(sorted(Deck(), key=lambda card: card.index))
+
+
+class Table:
+    """
+    One round of contract whist played a card at a time,
+    so the cards can be chosen from outside. Bids are made
+    by the `HeuristicPlayer`s sat at the table.
+    """
+
+    def __init__(self, players: list[HeuristicPlayer]):
+        self.game = Game(players)
+        self.game.DECK = Deck()  # shuffled in place, so not shared with other tables
+        self.players = players
+        self.trump: str | None = None
+        self.trick = Trick()
+        # playing order for each possible leader
+        self.orders = [
+            players[index:] + players[:index] for index in range(len(players))
+        ]
+        self.order = self.orders[0]
+
+    @property
+    def player(self) -> HeuristicPlayer:
+        """
+        The player whose turn it is to lay a card
+        """
+        return self.order[len(self.trick)]
+
+    def deal(
+        self, num_cards: int, trump: str | None, rng: random.Random | None = None
+    ) -> None:
+        self.trump = trump
+        Card.set_trump(trump)
+        for player in self.players:
+            player.round_reset()
+        hands = self.game.DECK.shuffle_and_deal(
+            num_cards=num_cards, num_players=len(self.players), rng=rng
+        )
+        self.game.get_bids([Hand(cards) for cards in hands])
+        self.trick.reset()
+        self.order = self.orders[0]
+
+    def observe(self) -> tuple[list[float], list[bool]]:
+        """
+        The state vector and legal move mask for the
+        player whose turn it is
+        """
+        Card.set_trump(self.trump)
+        player = self.player
+        mask = [False] * len(CARDS)
+        for card in player.hand.playable(self.trick):
+            mask[card.index] = True
+        return GameStateVector.generate_vector(player, self.trick), mask
+
+    def play(self, index: int) -> list[int] | None:
+        """
+        Lay the card for the player whose turn it is.
+
+        Returns each player's score once the round is over,
+        otherwise None.
+
+        raises ValueError if the card can't be played
+        """
+        Card.set_trump(self.trump)
+        player, card = self.player, CARDS[index]
+        if card not in player.hand.playable(self.trick):
+            raise ValueError(f"{player.name} can't play the {card}")
+        return self._lay(player, player.hand.play_card(card))
+
+    def play_heuristic(self) -> list[int] | None:
+        """
+        Let the player whose turn it is choose their own card,
+        otherwise the same as `play`
+        """
+        Card.set_trump(self.trump)
+        player = self.player
+        return self._lay(player, player.play_card(self.trick))
+
+    def _lay(self, player: HeuristicPlayer, card: Card) -> list[int] | None:
+        self.trick.add_card(player, card)
+        if len(self.trick) < len(self.players):
+            return None
+
+        winner = self.trick.resolve()
+        for player in self.players:
+            player.update_trick_result(self.trick)
+        self.order = self.orders[self.players.index(winner)]
+        self.trick.reset()
+        if len(winner.hand):
+            return None
+        return [
+            player.trick_count + Game.CONTRACT_BONUS
+            if player.trick_count == player.contract
+            else player.trick_count
+            for player in self.players
+        ]
+
+
+class WhistEnv:
+    """
+    A gym style environment stepping many tables at once.
+
+    Every player's cards are chosen by the agent (self-play),
+    each step lays one card at every table, for whoever's turn
+    it is there. Finished tables are dealt a new round
+    straight away with a random hand size from `hands` and a
+    random trump.
+
+    Observations are `GameStateVector`s, with a mask of the
+    cards allowed by `Hand.playable`.
+    """
+
+    def __init__(
+        self,
+        num_tables: int,
+        num_players: int = 4,
+        hands: list[int] | None = None,
+        bidder: tuple[float, float, int] = (1.05, 0.35, 6),
+        seed: int | None = None,
+    ):
+        self.hands = Game([]).hands if hands is None else hands
+        self.rng = random.Random(seed)  # also shuffles, leaving the global generator alone
+        self.tables = [
+            Table([HeuristicPlayer(f"player {i}", *bidder) for i in range(num_players)])
+            for _ in range(num_tables)
+        ]
+
+    @property
+    def num_players(self) -> int:
+        return len(self.tables[0].players)
+
+    def seats(self) -> np.ndarray:
+        """
+        Index of the player to act at each table
+        """
+        return np.array(
+            [table.players.index(table.player) for table in self.tables]
+        )
+
+    def reset(self) -> tuple[np.ndarray, np.ndarray]:
+        for table in self.tables:
+            self._deal(table)
+        return self._observe()
+
+    def step(
+        self, actions: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Lay card `actions[i]` at table i.
+
+        Returns the next observations and masks, then the round
+        scores of each player at tables that just finished
+        (zero elsewhere) and which tables finished.
+        """
+        rewards = np.zeros((len(self.tables), self.num_players), dtype=np.float32)
+        dones = np.zeros(len(self.tables), dtype=bool)
+        for i, (table, action) in enumerate(zip(self.tables, actions)):
+            if (scores := table.play(int(action))) is not None:
+                rewards[i], dones[i] = scores, True
+                self._deal(table)
+        return *self._observe(), rewards, dones
+
+    def _deal(self, table: Table) -> None:
+        table.deal(
+            self.rng.choice(self.hands), self.rng.choice(SUITS + (None,)), self.rng
+        )
+
+    def _observe(self) -> tuple[np.ndarray, np.ndarray]:
+        states, masks = zip(*(table.observe() for table in self.tables))
+        return np.array(states, dtype=np.float32), np.array(masks)
@@ -0,0 +1,191 @@
+from concurrent.futures import ProcessPoolExecutor
+import time
+
+import numpy as np
+import torch
+
+from contract_whist.data.env import WhistEnv, CARDS
+from contract_whist.data.whist_net import WhistNet
+
+STATE_SIZE = 164
+
+
+def masked_policy(
+    model: WhistNet, states: torch.Tensor, masks: torch.Tensor
+) -> torch.distributions.Categorical:
+    """
+    The model's distribution over cards with illegal moves
+    masked out
+    """
+    logits = model(states).masked_fill(~masks, float("-inf"))
+    return torch.distributions.Categorical(logits=logits)
+
+
+def collect_rollouts(
+    state_dict: dict[str, torch.Tensor],
+    hidden_size: int,
+    num_tables: int,
+    num_rounds: int,
+    seed: int,
+) -> dict[str, np.ndarray]:
+    """
+    Play at least `num_rounds` rounds of self-play with the given
+    weights across `num_tables` tables, returning every move made
+    in a finished round along with that player's round score.
+
+    Runs in the worker processes, so takes plain weights rather
+    than a model.
+    """
+    torch.set_num_threads(1)
+    torch.manual_seed(seed)
+    model = WhistNet(STATE_SIZE, hidden_size, len(CARDS))
+    model.load_state_dict(state_dict)
+    model.eval()
+
+    env = WhistEnv(num_tables, seed=seed)
+    states, masks = env.reset()
+    # moves made so far in each table's current round
+    pending: list[list[tuple]] = [[] for _ in range(num_tables)]
+    moves: list[tuple] = []
+    rounds = 0
+    while rounds < num_rounds:
+        seats = env.seats()
+        with torch.no_grad():
+            policy = masked_policy(
+                model, torch.from_numpy(states), torch.from_numpy(masks)
+            )
+            actions = policy.sample()
+            log_probs = policy.log_prob(actions)
+        for i in range(num_tables):
+            pending[i].append(
+                (states[i], masks[i], actions[i].item(), log_probs[i].item(), seats[i])
+            )
+        states, masks, rewards, dones = env.step(actions.numpy())
+        for i in np.flatnonzero(dones):
+            moves += [move + (rewards[i, move[-1]],) for move in pending[i]]
+            pending[i] = []
+            rounds += 1
+
+    states, masks, actions, log_probs, _, scores = zip(*moves)
+    return {
+        "states": np.array(states),
+        "masks": np.array(masks),
+        "actions": np.array(actions),
+        "log_probs": np.array(log_probs, dtype=np.float32),
+        "scores": np.array(scores, dtype=np.float32),
+    }
+
+
+class SelfPlayTrainer:
+    """
+    Trains a `WhistNet` to play cards by PPO against copies
+    of itself. Bidding is left to the heuristic.
+
+    Rollouts are played out in worker processes with the
+    current weights, then the learner makes batched updates
+    on everything they collected. A move's advantage is its
+    player's round score, normalised over the batch.
+    """
+
+    def __init__(
+        self,
+        hidden_size: int = 256,
+        workers: int = 4,
+        tables_per_worker: int = 64,
+        rounds_per_worker: int = 128,
+        lr: float = 3e-4,
+        clip: float = 0.2,
+        entropy_coef: float = 0.01,
+        epochs: int = 4,
+        batch_size: int = 1024,
+        seed: int = 0,
+    ):
+        self.model = WhistNet(STATE_SIZE, hidden_size, len(CARDS))
+        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=lr)
+        self.hidden_size = hidden_size
+        self.workers = workers
+        self.tables_per_worker = tables_per_worker
+        self.rounds_per_worker = rounds_per_worker
+        self.clip = clip
+        self.entropy_coef = entropy_coef
+        self.epochs = epochs
+        self.batch_size = batch_size
+        self.seed = seed
+
+    def rollouts(self, pool: ProcessPoolExecutor | None) -> dict[str, np.ndarray]:
+        state_dict = {k: v.detach().clone() for k, v in self.model.state_dict().items()}
+        seeds = range(self.seed + 1, self.seed + 1 + max(self.workers, 1))
+        self.seed = seeds[-1]  # fresh deals next time
+        jobs = [
+            (
+                state_dict,
+                self.hidden_size,
+                self.tables_per_worker,
+                self.rounds_per_worker,
+                seed,
+            )
+            for seed in seeds
+        ]
+        if pool is None:
+            results = [collect_rollouts(*job) for job in jobs]
+        else:
+            results = list(pool.map(collect_rollouts, *zip(*jobs)))
+        return {key: np.concatenate([r[key] for r in results]) for key in results[0]}
+
+    def update(self, batch: dict[str, np.ndarray]) -> float:
+        """
+        A few epochs of clipped PPO over the batch, returning
+        the mean loss
+        """
+        states = torch.from_numpy(batch["states"])
+        masks = torch.from_numpy(batch["masks"])
+        actions = torch.from_numpy(batch["actions"])
+        old_log_probs = torch.from_numpy(batch["log_probs"])
+        scores = torch.from_numpy(batch["scores"])
+        advantages = (scores - scores.mean()) / (scores.std() + 1e-8)
+
+        self.model.train()
+        losses = []
+        for _ in range(self.epochs):
+            for indices in torch.randperm(len(actions)).split(self.batch_size):
+                policy = masked_policy(self.model, states[indices], masks[indices])
+                ratio = torch.exp(policy.log_prob(actions[indices]) - old_log_probs[indices])
+                clipped = ratio.clamp(1 - self.clip, 1 + self.clip)
+                loss = (
+                    -torch.min(ratio * advantages[indices], clipped * advantages[indices]).mean()
+                    - self.entropy_coef * policy.entropy().mean()
+                )
+                self.optimizer.zero_grad()
+                loss.backward()
+                self.optimizer.step()
+                losses.append(loss.item())
+        return sum(losses) / len(losses)
+
+    def train(self, iterations: int) -> None:
+        """
+        Alternate collecting rollouts and updating, with
+        `workers=0` playing the rollouts in this process.
+        """
+        pool = ProcessPoolExecutor(self.workers) if self.workers else None
+        try:
+            for iteration in range(iterations):
+                start = time.perf_counter()
+                batch = self.rollouts(pool)
+                collected = time.perf_counter()
+                loss = self.update(batch)
+                print(
+                    f"Iteration [{iteration + 1}/{iterations}], "
+                    f"moves: {len(batch['actions'])}, "
+                    f"mean score: {batch['scores'].mean():.2f}, loss: {loss:.4f}, "
+                    f"rollout: {collected - start:.1f}s, "
+                    f"update: {time.perf_counter() - collected:.1f}s"
+                )
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+
+if __name__ == "__main__":
+    trainer = SelfPlayTrainer()
+    trainer.train(iterations=50)
+    torch.save(trainer.model.state_dict(), "whist_self_play.pth")
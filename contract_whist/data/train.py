@@ -0,0 +1,203 @@
+import random
+import time
+
+import numpy as np
+import torch
+
+from contract_whist.cards import SUITS
+from contract_whist.game import Game
+from contract_whist.players import HeuristicPlayer
+from contract_whist.data.env import CARDS, Table
+from contract_whist.data.whist_net import WhistNet, masked_cross_entropy_loss
+
+# Planes of the GameStateVector, see DataPlayer.generate_vector
+HAND = slice(0, len(CARDS))
+TRICK = slice(2 * len(CARDS), 3 * len(CARDS))
+
+# [52, 4] one hot suit of each card index
+CARD_SUITS = torch.tensor(
+    [[card.suit == suit for suit in SUITS] for card in CARDS], dtype=torch.float32
+)
+
+
+def legal_move_mask(states: torch.Tensor) -> torch.Tensor:
+    """
+    The cards that could have been played in each state, rebuilt
+    from the hand and current trick planes: cards of the lead
+    suit if the hand has any, otherwise the whole hand. The lead
+    card is the one with weight 2 in the trick plane.
+    """
+    hand = states[:, HAND] > 0
+    lead_suit = (states[:, TRICK] == 2).float() @ CARD_SUITS  # [batch, 4]
+    suit_counts = hand.float() @ CARD_SUITS
+    must_follow = (lead_suit * suit_counts).sum(dim=1, keepdim=True) > 0
+    in_lead_suit = (lead_suit @ CARD_SUITS.T) > 0
+    return hand & (~must_follow | in_lead_suit)
+
+
+def prepare(inputs: np.ndarray, outputs: np.ndarray) -> tuple[torch.Tensor, ...]:
+    """
+    Convert HarvestData's vectors into states, the index of the
+    card played and the result (+1 made contract, -1 missed)
+    """
+    states = torch.from_numpy(inputs.astype(np.float32))
+    targets = torch.from_numpy(np.abs(outputs).argmax(axis=1))
+    results = torch.from_numpy(outputs.sum(axis=1).astype(np.float32))
+    return states, targets, results
+
+
+@torch.no_grad()
+def validate(
+    model: WhistNet,
+    states: torch.Tensor,
+    targets: torch.Tensor,
+    results: torch.Tensor,
+    batch_size: int = 8192,
+) -> dict[str, float]:
+    """
+    Batched loss over a held out set, how often the masked
+    prediction matches moves that made their contract, and how
+    often the unmasked prediction would have been illegal.
+    """
+    model.eval()
+    loss = correct = positives = illegal = 0.0
+    for start in range(0, len(states), batch_size):
+        batch = slice(start, start + batch_size)
+        logits = model(states[batch]).float()
+        mask = legal_move_mask(states[batch])
+        loss += masked_cross_entropy_loss(logits, targets[batch], mask, results[batch]).sum().item()
+        predicted = logits.masked_fill(~mask, float("-inf")).argmax(dim=1)
+        made = results[batch] > 0
+        correct += (predicted == targets[batch])[made].sum().item()
+        positives += made.sum().item()
+        illegal += (~mask.gather(1, logits.argmax(dim=1, keepdim=True))).sum().item()
+    return {
+        "loss": loss / len(states),
+        "accuracy": correct / max(positives, 1),
+        "illegal": illegal / len(states),
+    }
+
+
+@torch.no_grad()
+def evaluate_against_heuristic(
+    model: WhistNet,
+    num_tables: int = 64,
+    num_rounds: int = 512,
+    bidder: tuple[float, float, int] = (1.05, 0.35, 6),
+    seed: int = 0,
+) -> dict[str, float]:
+    """
+    Seat the model at one place of each table against
+    HeuristicPlayers, with every table's choice made in one
+    batched forward pass. The model only lays cards, its bids
+    come from the heuristic like everyone else's.
+    """
+    model.eval()
+    rng = random.Random(seed)  # also shuffles, leaving the global generator alone
+    hands = Game([]).hands
+    tables = [
+        Table([HeuristicPlayer(f"player {i}", *bidder) for i in range(4)])
+        for _ in range(num_tables)
+    ]
+    seats = [i % 4 for i in range(num_tables)]  # move the model around the table
+    for table in tables:
+        table.deal(rng.choice(hands), rng.choice(SUITS + (None,)), rng)
+
+    net_scores, other_scores, made = [], [], 0
+
+    def finish(table: Table, seat: int, scores: list[int]) -> None:
+        nonlocal made
+        net_scores.append(scores[seat])
+        other_scores.extend(score for i, score in enumerate(scores) if i != seat)
+        made += table.players[seat].trick_count == table.players[seat].contract
+        table.deal(rng.choice(hands), rng.choice(SUITS + (None,)), rng)
+
+    while len(net_scores) < num_rounds:
+        for table, seat in zip(tables, seats):
+            while table.player is not table.players[seat]:
+                if (scores := table.play_heuristic()) is not None:
+                    finish(table, seat, scores)
+        states, masks = zip(*(table.observe() for table in tables))
+        logits = model(torch.tensor(np.array(states, dtype=np.float32)))
+        logits = logits.masked_fill(~torch.tensor(np.array(masks)), float("-inf"))
+        for table, seat, action in zip(tables, seats, logits.argmax(dim=1).tolist()):
+            if (scores := table.play(action)) is not None:
+                finish(table, seat, scores)
+
+    return {
+        "net score": sum(net_scores) / len(net_scores),
+        "heuristic score": sum(other_scores) / len(other_scores),
+        "net contracts made": made / len(net_scores),
+    }
+
+
+def train(
+    model: WhistNet,
+    states: torch.Tensor,
+    targets: torch.Tensor,
+    results: torch.Tensor,
+    epochs: int = 10,
+    batch_size: int = 4096,
+    lr: float = 3e-3,
+    validation_split: float = 0.1,
+    compile: bool = False,
+    mixed_precision: bool = False,
+    eval_every: int = 5,
+    eval_rounds: int = 512,
+) -> None:
+    """
+    Large batch training on the masked loss, slicing batches
+    straight out of the tensors rather than through a DataLoader.
+
+    compile runs the model through torch.compile and
+    mixed_precision runs the forward pass in bfloat16 on the CPU.
+    Every `eval_every` epochs the model plays HeuristicPlayers.
+    """
+    split = int(len(states) * (1 - validation_split))
+    order = torch.randperm(len(states))
+    train_index, valid_index = order[:split], order[split:]
+    valid = states[valid_index], targets[valid_index], results[valid_index]
+
+    forward = torch.compile(model) if compile else model
+    optimizer = torch.optim.Adam(model.parameters(), lr=lr)
+    for epoch in range(epochs):
+        model.train()
+        start = time.perf_counter()
+        total_loss = 0.0
+        for batch in train_index[torch.randperm(split)].split(batch_size):
+            with torch.autocast("cpu", dtype=torch.bfloat16, enabled=mixed_precision):
+                logits = forward(states[batch])
+            loss = masked_cross_entropy_loss(
+                logits.float(), targets[batch], legal_move_mask(states[batch]), results[batch]
+            ).mean()
+            optimizer.zero_grad()
+            loss.backward()
+            optimizer.step()
+            total_loss += loss.item() * len(batch)
+        elapsed = time.perf_counter() - start
+
+        metrics = validate(model, *valid) if len(valid_index) else {}
+        print(
+            f"Epoch [{epoch + 1}/{epochs}], Loss: {total_loss / split:.4f}, "
+            + "".join(f"valid {name}: {value:.4f}, " for name, value in metrics.items())
+            + f"{split / elapsed:,.0f} samples/s, {elapsed:.2f}s"
+        )
+        if eval_every and (epoch + 1) % eval_every == 0:
+            scores = evaluate_against_heuristic(model, num_rounds=eval_rounds)
+            print("  vs heuristic: " + ", ".join(f"{k}: {v:.3f}" for k, v in scores.items()))
+
+
+if __name__ == "__main__":
+    from contract_whist.players import DataPlayer
+    from contract_whist.data.data_gen import HarvestData
+
+    players = [
+        DataPlayer(name, 1.05, 0.35, 6)
+        for name in ("Fred", "Murray", "Sam", "Tim")
+    ]
+    inputs, outputs = HarvestData(players).get_data(hands=Game([]).hands, num_games=1000)
+    states, targets, results = prepare(inputs, outputs)
+
+    model = WhistNet(states.shape[1], 256, len(CARDS))
+    train(model, states, targets, results)
+    torch.save(model.state_dict(), "whist_model.pth")
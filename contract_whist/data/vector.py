@@ -1,9 +1,14 @@
-import numpy as np
+from __future__ import annotations
+from typing import TYPE_CHECKING
 
 from contract_whist.cards import Card, Deck, SUITS
-from contract_whist.players import Player
 from contract_whist.trick import Trick
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from contract_whist.players import Player
+
 
 class GameStateVector:
     DECK = Deck()
@@ -49,6 +54,8 @@ class GameStateVector:
         """
         Print the cards present in the vector
         """
+        import numpy as np
+
         print("Current hand:")
         cls.print_card_vector(vector[:(index := len(cls.DECK))])
         print("All cards seen:")
@@ -0,0 +1,281 @@
+"""
+Spread simulation jobs across processes or hosts.
+
+A coordinator hands out batches of games over TCP, each with
+its own seed, and collects what the workers send back. Any
+batch held by a worker that disconnects or goes quiet for
+longer than the lease is handed to the next worker to ask.
+
+Messages are single lines of JSON:
+    worker      -> {"type": "ready"}
+    coordinator -> {"type": "batch", "batch": {...}} or {"type": "done"}
+    worker      -> {"type": "result", "batch_id": 3, "result": {...}}
+
+    python -m contract_whist.distributed coordinator --port 5555 --games 10000
+    python -m contract_whist.distributed worker --host <coordinator> --port 5555
+"""
+import argparse
+from collections import deque
+from itertools import cycle
+import json
+import logging
+import os
+import random
+import socket
+import socketserver
+import threading
+import time
+
+import contract_whist.players
+from contract_whist.cards import Deck, SUITS
+from contract_whist.game import Game
+
+# (player class name from contract_whist.players, name, *args)
+PlayerSpec = list
+
+
+def make_batches(
+    players: list[PlayerSpec],
+    num_games: int,
+    batch_size: int,
+    hands: list[int] | None = None,
+    kind: str = "play",
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Split `num_games` games between `players` into batches.
+
+    kind is either:
+        - play: the batch result is each player's total points
+          and wins
+        - harvest: the batch plays DataPlayers through HarvestData
+          and saves the vectors as a shard, the result is its path
+    """
+    if kind not in ("play", "harvest"):
+        raise ValueError(f"kind must be play or harvest not {kind}")
+    hands = Game([]).hands if hands is None else hands
+    return [
+        {
+            "batch_id": batch_id,
+            "kind": kind,
+            "players": players,
+            "hands": hands,
+            "num_games": min(batch_size, num_games - start),
+            "seed": seed + batch_id,
+        }
+        for batch_id, start in enumerate(range(0, num_games, batch_size))
+    ]
+
+
+def build_players(specs: list[PlayerSpec]) -> list:
+    return [
+        getattr(contract_whist.players, class_name)(name, *args)
+        for class_name, name, *args in specs
+    ]
+
+
+def run_batch(batch: dict, shard_dir: str = ".") -> dict:
+    """
+    Play one batch, seeded so the same batch always plays
+    out the same wherever it runs. Each game gets a fresh deck
+    and trump order, as both otherwise carry over between games.
+    """
+    random.seed(batch["seed"])
+    players = build_players(batch["players"])
+    if batch["kind"] == "harvest":
+        import numpy as np
+
+        from contract_whist.data.data_gen import HarvestData
+
+        game = HarvestData(players)
+        game.DECK, game.SUIT_ORDER = Deck(), cycle(SUITS + (None,))
+        inputs, outputs = game.get_data(batch["hands"], batch["num_games"])
+        path = os.path.join(shard_dir, f"shard_{batch['batch_id']:05d}.npz")
+        np.savez(path, inputs=inputs, outputs=outputs)
+        return {"path": os.path.abspath(path), "samples": len(inputs)}
+
+    points = {player.name: 0 for player in players}
+    wins = {player.name: 0 for player in players}
+    for _ in range(batch["num_games"]):
+        for player in players:
+            player.points = 0
+        game = Game(players[:])
+        game.DECK, game.SUIT_ORDER = Deck(), cycle(SUITS + (None,))
+        scores = game.play_game(batch["hands"])
+        for name, score in scores.items():
+            points[name] += score
+            wins[name] += score == max(scores.values())
+    return {"games": batch["num_games"], "points": points, "wins": wins}
+
+
+class Coordinator:
+    """
+    Serves batches to workers until every batch has a result.
+    """
+
+    def __init__(
+        self,
+        batches: list[dict],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        lease_timeout: float = 600.0,
+    ):
+        self.pending = deque(batches)
+        self.num_batches = len(batches)
+        self.results: dict[int, dict] = {}
+        self.lease_timeout = lease_timeout
+        self.condition = threading.Condition()
+
+        self.server = socketserver.ThreadingTCPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.coordinator = self
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server.server_address
+
+    @property
+    def finished(self) -> bool:
+        return len(self.results) == self.num_batches
+
+    def checkout(self) -> dict | None:
+        """
+        The next batch to hand out, waiting for one to be
+        requeued if all are out. None once all are done.
+        """
+        with self.condition:
+            while not self.pending and not self.finished:
+                self.condition.wait()
+            return self.pending.popleft() if self.pending else None
+
+    def complete(self, batch_id: int, result: dict) -> None:
+        with self.condition:
+            self.results.setdefault(batch_id, result)  # requeued twice, keep first
+            self.condition.notify_all()
+
+    def requeue(self, batch: dict) -> None:
+        with self.condition:
+            if batch["batch_id"] not in self.results:
+                logging.warning(f"requeueing batch {batch['batch_id']}")
+                self.pending.appendleft(batch)
+                self.condition.notify_all()
+
+    def run(self) -> dict[int, dict]:
+        """
+        Serve until every batch has a result, then return them
+        """
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        with self.condition:
+            while not self.finished:
+                self.condition.wait()
+        self.server.shutdown()
+        self.server.server_close()
+        return self.results
+
+    @staticmethod
+    def aggregate(results: dict[int, dict]) -> dict:
+        """
+        Total up the results of "play" batches
+        """
+        total = {"games": 0, "points": {}, "wins": {}}
+        for result in results.values():
+            total["games"] += result["games"]
+            for key in ("points", "wins"):
+                for name, value in result[key].items():
+                    total[key][name] = total[key].get(name, 0) + value
+        return total
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        coordinator: Coordinator = self.server.coordinator
+        self.request.settimeout(coordinator.lease_timeout)
+        batch = None
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message["type"] == "result" and batch is not None:
+                    # only accept the result of the batch this connection leased
+                    if message["batch_id"] != batch["batch_id"]:
+                        logging.warning(
+                            f"{self.client_address} sent batch {message['batch_id']}"
+                            f" while leasing {batch['batch_id']}"
+                        )
+                        return
+                    coordinator.complete(batch["batch_id"], message["result"])
+                    batch = None
+                if (batch := coordinator.checkout()) is None:
+                    self._send({"type": "done"})
+                    return
+                self._send({"type": "batch", "batch": batch})
+        except (OSError, ValueError) as error:  # timeouts, resets, bad json
+            logging.warning(f"lost worker {self.client_address}: {error}")
+        finally:
+            if batch is not None:
+                coordinator.requeue(batch)
+
+    def _send(self, message: dict) -> None:
+        self.wfile.write(json.dumps(message).encode() + b"\n")
+        self.wfile.flush()
+
+
+def run_worker(host: str, port: int, shard_dir: str = ".", retry: float = 30.0) -> int:
+    """
+    Work through batches from the coordinator until it says
+    it's done, returning how many batches this worker ran.
+    """
+    deadline = time.monotonic() + retry
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)  # coordinator still starting
+
+    completed = 0
+    with connection, connection.makefile("rwb") as stream:
+        message = {"type": "ready"}
+        while True:
+            stream.write(json.dumps(message).encode() + b"\n")
+            stream.flush()
+            reply = json.loads(stream.readline())
+            if reply["type"] == "done":
+                return completed
+            batch = reply["batch"]
+            message = {
+                "type": "result",
+                "batch_id": batch["batch_id"],
+                "result": run_batch(batch, shard_dir),
+            }
+            completed += 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("role", choices=("coordinator", "worker"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--kind", choices=("play", "harvest"), default="play")
+    parser.add_argument("--shard-dir", default=".")
+    args = parser.parse_args()
+
+    if args.role == "worker":
+        print(f"ran {run_worker(args.host, args.port, args.shard_dir)} batches")
+    else:
+        player_class = "DataPlayer" if args.kind == "harvest" else "HeuristicPlayer"
+        players = [[player_class, name, 1.05, 0.35, 6] for name in ("A", "B", "C", "D")]
+        batches = make_batches(
+            players, args.games, args.batch_size, kind=args.kind
+        )
+        coordinator = Coordinator(batches, args.host, args.port)
+        results = coordinator.run()
+        if args.kind == "play":
+            print(Coordinator.aggregate(results))
+        else:
+            for result in results.values():
+                print(result["path"])
@@ -2,9 +2,6 @@ from itertools import cycle
 import logging
 logging.basicConfig(level=logging.CRITICAL)
 
-import numpy as np
-import matplotlib.pyplot as plt
-
 from contract_whist.players import Player, HumanPlayer, RandomPlayer, HeuristicPlayer
 
 from contract_whist.cards import Deck, SUITS
@@ -34,8 +31,10 @@ class Game:
         """
         options = set(range(len(hands[0]) + 1))
         bids = {}
-        for player, hand in zip(self.players, hands):
+        for seat, (player, hand) in enumerate(zip(self.players, hands)):
             player.hand = hand
+            player.seat = seat
+            player.table_size = self.num_players
             if player is self.players[-1]:  # dealer
                 if (forbidden := len(hands[0]) - sum(bids.values())) >= 0:
                     options.remove(forbidden)
@@ -55,17 +54,31 @@ class Game:
         hands = self.DECK.shuffle_and_deal(
             num_cards=num_tricks, num_players=self.num_players
         )
-        contracts = self.get_bids([Hand(cards) for cards in hands])
+        return self.play_hands([Hand(cards) for cards in hands])
+
+    def play_hands(self, hands: list[Hand]) -> dict[Player, int]:
+        """
+        Bid and play out a round from hands already dealt,
+        in playing order, with trumps already set.
+        """
+        num_tricks = len(hands[0])
+        contracts = self.get_bids(hands)
         for player, bid in contracts.items():
             logging.info(f"{player.name:<20s} | {bid:2d}")
 
         tricks: dict[Player, int] = {player: 0 for player in self.players}
 
+        # playing order for each possible leader, and one trick reused throughout
+        orders = [
+            self.players[index:] + self.players[:index]
+            for index in range(self.num_players)
+        ]
+        trick = Trick()
         leader_index = 0
         for trick_number in range(num_tricks):
             logging.info(f"trick {trick_number + 1}:")
-            trick = Trick()
-            for player in self.players[leader_index:] + self.players[:leader_index]:
+            trick.reset()
+            for player in orders[leader_index]:
                 trick.add_card(player, player.play_card(trick))
 
             winner = trick.resolve()
@@ -109,9 +122,13 @@ if __name__ == "__main__":
     players = [HumanPlayer("Fred")] + [
         HeuristicPlayer(name, 1.05, 0.35, 6) for name in ("Joe", "Tim", "Cookie")
     ]
+    players[0].enable_hints(players)
     game = Game(players)
     game.play_game([7, 5])
 
+#     import numpy as np
+#     import matplotlib.pyplot as plt
+
 #     trump_multipliers = np.linspace(0.95, 1.3, 10)
 #     card_multipliers = np.linspace(0.1, 0.5, 10)
 
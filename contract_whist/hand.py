@@ -1,15 +1,26 @@
-from functools import reduce
-from operator import add
-from collections import defaultdict
-from typing import Iterator
+from itertools import chain
+from typing import Iterator, KeysView
 
-from contract_whist.cards import Card
+from contract_whist.cards import Card, SUITS
 from contract_whist.trick import Trick
 
 
 class Hand:
+    """
+    The cards held by a player.
+
+    Cards are kept in per-suit buckets alongside the flat
+    sorted list, so suit membership and the playable cards
+    are lookups rather than scans of the whole hand. The
+    playable tuples are cached until the hand next changes.
+    """
+
+    __slots__ = ("_suits", "_playable", "cards", "total")
+
     def __init__(self, cards: list[Card]):
-        self.cards = sorted(self.sort_hand(cards))
+        self._suits: dict[str, list[Card]] = self.bucket_by_suit(cards)
+        self._playable: dict[str | None, tuple[Card, ...]] = {}
+        self.cards = list(chain.from_iterable(self._suits.values()))
         self.total = len(cards)
 
     def __len__(self) -> int:
@@ -32,15 +43,28 @@ class Hand:
         return (self.total - len(self)) / self.total
 
     @staticmethod
-    def sort_hand(cards: list[Card]) -> list[Card]:
+    def bucket_by_suit(cards: list[Card]) -> dict[str, list[Card]]:
+        """
+        Group the cards by suit, each suit sorted by value.
+        Suits keep the order they first appear in, except
+        trumps which always come last.
+        """
+        suits: dict[str, list[Card]] = {}
+        for card in cards:
+            suits.setdefault(card.suit, []).append(card)
+        if Card.TRUMP in suits:
+            suits[Card.TRUMP] = suits.pop(Card.TRUMP)
+        for suit_cards in suits.values():
+            suit_cards.sort(key=lambda card: card.value)
+        return suits
+
+    @classmethod
+    def sort_hand(cls, cards: list[Card]) -> list[Card]:
         """
         This method sorts the cards by suit, and by order
         in that suit
         """
-        suits = defaultdict(list)
-        for card in cards:
-            suits[card.suit].append(card)
-        return reduce(add, map(sorted, suits.values()))
+        return list(chain.from_iterable(cls.bucket_by_suit(cards).values()))
 
     @staticmethod
     def sort_by_value(cards: list[Card]) -> list[Card]:
@@ -54,22 +78,42 @@ class Hand:
         ) + sorted([card for card in cards if card.suit == card.TRUMP])
 
     @property
-    def suits(self) -> set[str]:
-        return set(card.suit for card in self.cards)
+    def suits(self) -> KeysView[str]:
+        return self._suits.keys()
+
+    def canonical_key(self, trump: str | None) -> tuple:
+        """
+        A key shared by every hand that is this one with the
+        non-trump suits swapped around, as those hands are
+        equally strong. Each suit is the tuple of its values,
+        the trump suit first (None for no trumps) then the
+        rest in descending order.
+        """
+        values = {
+            suit: tuple(int(card.value) for card in cards)
+            for suit, cards in self._suits.items()
+        }
+        others = sorted(
+            (values.get(suit, ()) for suit in SUITS if suit != trump), reverse=True
+        )
+        return (None if trump is None else values.get(trump, ()), tuple(others))
 
-    def playable(self, trick: Trick) -> list[Card]:
+    def playable(self, trick: Trick) -> tuple[Card, ...]:
         """
-        Return the list of playable cards given that the
-        player MUST follow suit if they can
+        Return the playable cards given that the player
+        MUST follow suit if they can
         """
-        if trick.lead_suit in self.suits:
-            # must follow suit, if leading then lead_suit is None
-            return [card for card in self.cards if card.suit == trick.lead_suit]
-        else:
-            return self.cards[:]  # copy of self.cards
+        # must follow suit, if leading then lead_suit is None
+        lead_suit = trick.lead_suit if trick.lead_suit in self._suits else None
+        if (playable := self._playable.get(lead_suit)) is None:
+            cards = self.cards if lead_suit is None else self._suits[lead_suit]
+            playable = self._playable[lead_suit] = tuple(cards)
+        return playable
 
     def pop(self, index: int) -> Card:
-        return self.cards.pop(index)
+        card = self.cards.pop(index)
+        self._discard(card)
+        return card
 
     def play_card(self, card: Card) -> Card:
         """
@@ -77,4 +121,17 @@ class Hand:
 
         raises ValueError if card not in hand
         """
-        return self.cards.pop(self.cards.index(card))
+        self.cards.remove(card)
+        self._discard(card)
+        return card
+
+    def _discard(self, card: Card) -> None:
+        """
+        Remove an already popped card from its suit bucket
+        and invalidate the cached playable cards
+        """
+        suit_cards = self._suits[card.suit]
+        suit_cards.remove(card)
+        if not suit_cards:
+            del self._suits[card.suit]
+        self._playable.clear()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+from functools import lru_cache
+from math import factorial, prod
+import random
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from contract_whist.cards import Card, Deck, SUITS
+from contract_whist.hand import Hand
+from contract_whist.trick import Trick
+
+if TYPE_CHECKING:
+    from contract_whist.players import Player
+
+# Cards looked up by `Card.index`, which is also their bit in a mask
+CARDS = tuple(sorted(Deck(), key=lambda card: card.index))
+SUIT_MASKS = {
+    suit: sum(1 << card.index for card in CARDS if card.suit == suit)
+    for suit in SUITS
+}
+FULL_MASK = (1 << len(CARDS)) - 1
+
+# Groups of cards as (holders that could have them, number of cards)
+Classes = tuple[tuple[tuple[int, ...], int], ...]
+
+
+def to_mask(cards: Iterable[Card]) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << card.index
+    return mask
+
+
+def to_cards(mask: int) -> list[Card]:
+    cards = []
+    while mask:
+        low_bit = mask & -mask
+        cards.append(CARDS[low_bit.bit_length() - 1])
+        mask ^= low_bit
+    return cards
+
+
+class HandInference:
+    """
+    Tracks which of the unseen cards each opponent could be
+    holding, from one player's point of view.
+
+    Every unseen card is either in an opponent's hand or in
+    the undealt part of the deck (held by `None` here). Failing
+    to follow suit shows an opponent is void in the lead suit.
+    Candidate cards are kept as bitmasks over `Card.index`.
+    """
+
+    def __init__(self, hand: Hand, opponents: list[Player], num_players: int):
+        self.opponents = opponents
+        self.bids: dict[Player, int] = {}
+        self.voids: dict[Player, set[str]] = {player: set() for player in opponents}
+
+        self.unseen = FULL_MASK & ~to_mask(hand)
+        self.held: dict[Player | None, int] = {player: hand.total for player in opponents}
+        self.held[None] = len(CARDS) - hand.total * num_players
+        # sampling setup, kept until the next card is seen
+        self._setup_cache: tuple[Classes, tuple[int, ...], list[list[Card]]] | None = None
+
+    def observe_bid(self, player: Player, bid: int) -> None:
+        """
+        Bids don't rule out any cards, they are kept for
+        anything weighting the sampled deals.
+        """
+        self.bids[player] = bid
+
+    def observe_card(self, player: Player, card: Card, lead_suit: str | None) -> None:
+        """
+        Record a card laid in a trick. Cards already seen
+        are ignored, so a trick can be observed while it is
+        being played and again once it is complete.
+        """
+        bit = 1 << card.index
+        if not self.unseen & bit:
+            return  # our own card or seen before
+        self.unseen ^= bit
+        self.held[player] -= 1
+        self._setup_cache = None
+        if lead_suit is not None and card.suit != lead_suit:
+            self.voids[player].add(lead_suit)
+
+    def observe_trick(self, trick: Trick) -> None:
+        for player, card in zip(trick.players, trick.cards):
+            self.observe_card(player, card, trick.lead_suit)
+
+    def candidates(self) -> dict[Player | None, int]:
+        """
+        The mask of cards each holder could have, tightened
+        until no holder's candidates are forced:
+            - a holder with exactly as many candidates as
+              cards held must hold all of them
+            - a card only one holder can take is theirs
+
+        raises ValueError if no deal fits the observations
+        """
+        allowed = {
+            holder: self.unseen & ~self._void_mask(holder) for holder in self.held
+        }
+        changed = True
+        while changed:
+            changed = False
+            for holder, mask in allowed.items():
+                need = self.held[holder]
+                others = 0
+                for other, other_mask in allowed.items():
+                    if other is not holder:
+                        others |= other_mask
+                forced = mask & ~others
+                if mask.bit_count() < need or forced.bit_count() > need:
+                    raise ValueError(f"no consistent deal gives {holder} {need} cards")
+                if mask.bit_count() == need:
+                    taken = mask
+                elif forced.bit_count() == need:
+                    taken = allowed[holder] = forced
+                    changed = True
+                else:
+                    continue
+                for other, other_mask in allowed.items():
+                    if other is not holder and other_mask & taken:
+                        allowed[other] = other_mask & ~taken
+                        changed = True
+        return allowed
+
+    def count(self) -> int:
+        """
+        The number of deals of the unseen cards consistent
+        with everything observed
+        """
+        classes, capacities, _ = self._setup()
+        return _deal_counter(classes).ways(0, capacities)
+
+    def sample(self, rng: random.Random | None = None) -> dict[Player, list[Card]]:
+        """
+        Draw one opponent deal uniformly from all deals
+        consistent with the observations.
+        """
+        rng = random if rng is None else rng
+        classes, capacities, class_cards = self._setup()
+        splits = _deal_counter(classes).sample(capacities, rng)
+
+        holders = list(self.held)
+        deal: dict[Player, list[Card]] = {player: [] for player in self.opponents}
+        for cards, split in zip(class_cards, splits):
+            cards = rng.sample(cards, len(cards))
+            start = 0
+            for holder_index, number in split:
+                if holders[holder_index] is not None:
+                    deal[holders[holder_index]] += cards[start : start + number]
+                start += number
+        return deal
+
+    def _void_mask(self, holder: Player | None) -> int:
+        if holder is None:
+            return 0
+        return sum(SUIT_MASKS[suit] for suit in self.voids[holder])
+
+    def _setup(self) -> tuple[Classes, tuple[int, ...], list[list[Card]]]:
+        """
+        Group the unseen cards by which holders could have them.
+        Only the group sizes matter for counting, so they are
+        the key for the cached counter. Cached until the next
+        card is observed.
+        """
+        if self._setup_cache is not None:
+            return self._setup_cache
+        allowed = list(self.candidates().values())
+        groups: dict[tuple[int, ...], int] = {}
+        for bit_index in range(len(CARDS)):
+            bit = 1 << bit_index
+            if self.unseen & bit:
+                members = tuple(i for i, mask in enumerate(allowed) if mask & bit)
+                groups[members] = groups.get(members, 0) | bit
+        ordered = sorted(groups.items())
+        classes = tuple((members, mask.bit_count()) for members, mask in ordered)
+        self._setup_cache = (
+            classes, tuple(self.held.values()), [to_cards(mask) for _, mask in ordered]
+        )
+        return self._setup_cache
+
+
+@lru_cache(maxsize=256)
+def _deal_counter(classes: Classes) -> _DealCounter:
+    return _DealCounter(classes)
+
+
+class _DealCounter:
+    """
+    Counts the ways to share out groups of cards between holders
+    with fixed hand sizes, where each group of cards can only go
+    to some of the holders. Memoised on the group reached and the
+    space left in each hand, so counts are shared between samples.
+    """
+
+    def __init__(self, classes: Classes):
+        self.classes = classes
+        self.memo: dict[tuple[int, tuple[int, ...]], int] = {}
+
+    def ways(self, index: int, capacities: tuple[int, ...]) -> int:
+        if index == len(self.classes):
+            return 0 if any(capacities) else 1
+        key = (index, capacities)
+        if (total := self.memo.get(key)) is None:
+            total = sum(weight for _, _, weight in self._branches(index, capacities))
+            self.memo[key] = total
+        return total
+
+    def sample(
+        self, capacities: tuple[int, ...], rng: random.Random
+    ) -> list[list[tuple[int, int]]]:
+        """
+        Choose how many cards of each group every holder gets,
+        weighted by the number of deals each choice allows.
+        """
+        if (total := self.ways(0, capacities)) == 0:
+            raise ValueError("no deal is consistent with the observations")
+        splits = []
+        for index in range(len(self.classes)):
+            choice = rng.randrange(total)
+            for split, remaining, weight in self._branches(index, capacities):
+                if choice < weight:
+                    break
+                choice -= weight
+            splits.append(split)
+            capacities, total = remaining, self.ways(index + 1, remaining)
+        return splits
+
+    def _branches(
+        self, index: int, capacities: tuple[int, ...]
+    ) -> Iterator[tuple[list[tuple[int, int]], tuple[int, ...], int]]:
+        members, size = self.classes[index]
+        for numbers in _compositions(size, [capacities[i] for i in members]):
+            remaining = list(capacities)
+            for member, number in zip(members, numbers):
+                remaining[member] -= number
+            remaining = tuple(remaining)
+            if weight := self.ways(index + 1, remaining):
+                arrangements = factorial(size) // prod(map(factorial, numbers))
+                yield list(zip(members, numbers)), remaining, arrangements * weight
+
+
+def _compositions(total: int, limits: list[int]) -> Iterator[tuple[int, ...]]:
+    """
+    Every way of writing `total` as len(limits) ordered parts,
+    each part no bigger than its limit
+    """
+    if not limits:
+        if total == 0:
+            yield ()
+        return
+    tail = sum(limits[1:])  # most the later parts can take
+    for first in range(max(0, total - tail), min(total, limits[0]) + 1):
+        for rest in _compositions(total - first, limits[1:]):
+            yield (first,) + rest
@@ -0,0 +1,203 @@
+from collections import Counter
+from itertools import combinations, cycle
+from typing import Iterator
+import logging
+import os
+import random
+
+from contract_whist.cards import Deck, SUITS
+from contract_whist.game import Game
+from contract_whist.players import Player
+
+
+class Entrant:
+    """
+    A named player configuration, rebuilt in whichever
+    process plays the match so only the config is sent.
+    """
+
+    def __init__(self, name: str, player_class: type[Player], *args):
+        self.name = name
+        self.player_class = player_class
+        self.args = args
+
+        self.rating: float = 1500.0
+        self.games: int = 0
+        self.wins: int = 0
+        self.points: int = 0
+
+    def __repr__(self):
+        return self.name
+
+    def build(self) -> Player:
+        return self.player_class(self.name, *self.args)
+
+
+def play_match(entrants: list[Entrant], seed: int) -> dict[str, int]:
+    """
+    Play a full game between the entrants, in the order given.
+    The deck and trump order are fresh for each match so the
+    seed alone decides the game.
+    """
+    random.seed(seed)
+    game = Game([entrant.build() for entrant in entrants])
+    game.DECK, game.SUIT_ORDER = Deck(), cycle(SUITS + (None,))
+    return game.play_game(game.hands)
+
+
+class League:
+    """
+    Rates a pool of player configs by playing games between
+    them on a process pool, updating Elo ratings as each game
+    finishes. A game is scored as every pair of players at
+    the table having played each other.
+
+    Schedules are either:
+        - round robin: every table of `table_size` entrants once
+          per cycle, drawn lazily so large pools don't build the
+          whole schedule up front
+        - swiss: tables of closely rated players, favouring
+          those with few games, as they are the games whose
+          result is least predictable so teach the most
+    """
+
+    def __init__(
+        self,
+        entrants: list[Entrant],
+        table_size: int = 4,
+        k_factor: float = 32.0,
+        workers: int | None = None,
+        seed: int = 0,
+    ):
+        if len(entrants) < table_size:
+            raise ValueError(f"need at least {table_size} entrants not {len(entrants)}")
+        if len({entrant.name for entrant in entrants}) != len(entrants):
+            raise ValueError("entrant names must be unique")
+        self.entrants = {entrant.name: entrant for entrant in entrants}
+        self.table_size = table_size
+        self.k_factor = k_factor
+        self.workers = workers
+        self.rng = random.Random(seed)
+
+    @staticmethod
+    def expected(rating: float, other: float) -> float:
+        return 1 / (1 + 10 ** ((other - rating) / 400))
+
+    def update(self, scores: dict[str, int]) -> None:
+        """
+        Update the ratings from one game's final scores
+        """
+        changes = {name: 0.0 for name in scores}
+        k = self.k_factor / (len(scores) - 1)
+        for name, other in combinations(scores, 2):
+            if scores[name] == scores[other]:
+                result = 0.5
+            else:
+                result = float(scores[name] > scores[other])
+            expected = self.expected(
+                self.entrants[name].rating, self.entrants[other].rating
+            )
+            change = k * (result - expected)
+            changes[name] += change
+            changes[other] -= change
+        winning_score = max(scores.values())
+        for name, change in changes.items():
+            entrant = self.entrants[name]
+            entrant.rating += change
+            entrant.games += 1
+            entrant.points += scores[name]
+            entrant.wins += scores[name] == winning_score
+
+    def round_robin(self) -> Iterator[tuple[Entrant, ...]]:
+        """
+        One cycle of every table of `table_size` entrants, in
+        an order shuffled per cycle
+        """
+        entrants = list(self.entrants.values())
+        self.rng.shuffle(entrants)
+        return combinations(entrants, self.table_size)
+
+    def swiss(self, in_flight: Counter[str]) -> list[Entrant]:
+        """
+        The most informative table: neighbours in the ratings
+        whose results are closest to a coin toss, weighted
+        towards those who have played least, counting games
+        still being played. Entrants already playing are only
+        seated again when there aren't enough free ones.
+        """
+        free = [
+            entrant for name, entrant in self.entrants.items() if not in_flight[name]
+        ]
+        if len(free) < self.table_size:
+            free = list(self.entrants.values())
+        free.sort(key=lambda entrant: entrant.rating)
+        games = {
+            entrant.name: entrant.games + in_flight[entrant.name] for entrant in free
+        }
+        best, best_gain = None, -1.0
+        for start in range(len(free) - self.table_size + 1):
+            table = free[start : start + self.table_size]
+            gain = sum(
+                self.expected(a.rating, b.rating)
+                * self.expected(b.rating, a.rating)
+                * (1 / (1 + games[a.name]) + 1 / (1 + games[b.name]))
+                for a, b in combinations(table, 2)
+            )
+            if gain > best_gain:
+                best, best_gain = table, gain
+        return best
+
+    def run(self, num_games: int, schedule: str = "swiss") -> None:
+        """
+        Play `num_games` games, keeping every worker busy and
+        scheduling each new table from the latest ratings.
+        """
+        if schedule not in ("swiss", "round_robin"):
+            raise ValueError(f"schedule must be swiss or round_robin not {schedule}")
+        # only the parent needs the pool, workers just import play_match
+        from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+        tables: Iterator[tuple[Entrant, ...]] = iter(())
+        running: dict[Future, list[Entrant]] = {}
+        played = 0
+        with ProcessPoolExecutor(self.workers) as pool:
+            slots = 2 * (self.workers or os.cpu_count() or 1)  # a spare game per worker
+            while played < num_games:
+                while len(running) < slots and played + len(running) < num_games:
+                    if schedule == "round_robin":
+                        if (table := next(tables, None)) is None:
+                            tables = self.round_robin()
+                            table = next(tables)
+                        table = list(table)
+                    else:
+                        in_flight = Counter(
+                            entrant.name for table in running.values() for entrant in table
+                        )
+                        table = self.swiss(in_flight)
+                    self.rng.shuffle(table)  # random seating
+                    future = pool.submit(play_match, table, self.rng.getrandbits(32))
+                    running[future] = table
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    running.pop(future)
+                    self.update(future.result())
+                    played += 1
+                    logging.info(f"game {played}/{num_games}: {future.result()}")
+            for future in running:
+                future.cancel()
+
+    def leaderboard(self) -> list[Entrant]:
+        return sorted(
+            self.entrants.values(), key=lambda entrant: entrant.rating, reverse=True
+        )
+
+    def write_leaderboard(self, path: str) -> None:
+        lines = ["rank | name                 |  rating | games | wins | avg points"]
+        for rank, entrant in enumerate(self.leaderboard(), start=1):
+            average = entrant.points / entrant.games if entrant.games else 0.0
+            lines.append(
+                f"{rank:4d} | {entrant.name:20s} | {entrant.rating:7.1f} | "
+                f"{entrant.games:5d} | {entrant.wins:4d} | {average:6.1f}"
+            )
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
@@ -3,4 +3,25 @@ from contract_whist.players.player import Player
 from contract_whist.players.human_player import HumanPlayer
 from contract_whist.players.random_player import RandomPlayer
 from contract_whist.players.heuristic_player import HeuristicPlayer
-from contract_whist.players.data_player import DataPlayer
+
+__all__ = [
+    "Player",
+    "HumanPlayer",
+    "RandomPlayer",
+    "HeuristicPlayer",
+    "DataPlayer",
+    "TablePlayer",
+]
+
+
+def __getattr__(name: str):
+    # These bring in the data tooling, only load them when asked for
+    if name == "DataPlayer":
+        from contract_whist.players.data_player import DataPlayer
+
+        return DataPlayer
+    if name == "TablePlayer":
+        from contract_whist.players.table_player import TablePlayer
+
+        return TablePlayer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,6 +8,8 @@ from contract_whist.data.vector import GameStateVector
 
 
 class DataPlayer(HeuristicPlayer):
+    __slots__ = ("state_vectors", "play_indices", "vector")
+
     DECK = Deck()
 
     def __init__(
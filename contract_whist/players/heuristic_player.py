@@ -1,5 +1,6 @@
 import logging
 
+from contract_whist.cache import LRUCache
 from contract_whist.cards import Card
 from contract_whist.trick import Trick
 from contract_whist.hand import Hand
@@ -17,18 +18,25 @@ class HeuristicPlayer(Player):
     trump_multiplier: 1.05
     card_multiplier: 0.35
     card_cutoff: 6
+
+    Hand evaluations can be shared through an `LRUCache`, keyed
+    by the parameters and `Hand.canonical_key`.
     """
 
+    __slots__ = ("trump_multiplier", "card_multiplier", "card_cutoff", "cache")
+
     def __init__(
         self,
         name: str,
         trump_multiplier: float,
         card_multiplier: float,
         card_cutoff: int,
+        cache: LRUCache | None = None,
     ):
         self.trump_multiplier = trump_multiplier
         self.card_multiplier = card_multiplier
         self.card_cutoff = card_cutoff
+        self.cache = cache
         super().__init__(name)
 
     def make_bid(self, options: set[int]) -> int:
@@ -65,7 +73,7 @@ class HeuristicPlayer(Player):
         playable = self.hand.playable(trick)
         if len(playable) == 1:
             logging.debug(f"{self.name} has no choice: {playable[0]} from {self.hand.cards}")
-            card = playable.pop()
+            card = playable[0]
         elif self.trick_count == self.contract:  # try and throw away cards
             if len(trick) == 0:  # playing first
                 card = self.min_face_card(playable)
@@ -121,6 +129,20 @@ class HeuristicPlayer(Player):
         """
         A rough heuristic for evaluating hand strengths
         """
+        if self.cache is None:
+            return self.score_hand(hand)
+        key = (
+            self.trump_multiplier,
+            self.card_multiplier,
+            self.card_cutoff,
+            hand.canonical_key(Card.TRUMP),
+        )
+        return self.cache.get(key, lambda: self.score_hand(hand))
+
+    def score_hand(self, hand: Hand) -> float:
+        """
+        evaluate_hand without the cache
+        """
         score = 0.0
         for card in hand.cards:
             if card.suit == card.TRUMP:
@@ -1,19 +1,46 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
 from contract_whist.players.player import Player
 
 from contract_whist.trick import Trick
 from contract_whist.cards import Card
 
+if TYPE_CHECKING:
+    from contract_whist.analysis import Analyst
+
 
 class HumanPlayer(Player):
     """
     Waits for input by human for bidding and playing
     cards.
+
+    With hints enabled, entering "h" when choosing a card shows
+    the estimated chance of making the contract with each card,
+    improving each time it is asked while the analysis runs.
     """
 
+    __slots__ = ("analyst",)
+
+    def __init__(self, name: str):
+        self.analyst: Analyst | None = None
+        super().__init__(name)
+
+    def enable_hints(self, players: list[Player], **kwargs) -> None:
+        """
+        Analyse the options in background threads, `players` is
+        everyone at the table in seating order
+        """
+        from contract_whist.analysis import Analyst
+
+        self.analyst = Analyst(self, players, **kwargs)
+
     def make_bid(self, options: set[int]) -> int:
         """
         Request the player to enter a bid value
         """
+        if self.analyst is not None:
+            self.analyst.new_round()
         bid = -1
         print(self.hand)
         while bid not in options:
@@ -24,20 +51,40 @@ class HumanPlayer(Player):
         self.contract = bid
         return bid
 
+    def update_trick_result(self, trick: Trick) -> None:
+        if self.analyst is not None:
+            self.analyst.observe(trick)
+        super().update_trick_result(trick)
+
     def play_card(self, trick: Trick) -> Card:
         playable = self.hand.playable(trick)
+        if self.analyst is not None:
+            self.analyst.start(trick)
         print(
             f"{self.name} choose from ({self.trick_count} / {self.contract}): played so far: {trick.cards}"
         )
+        choices = {i for i, card in enumerate(self.hand) if card in playable}
         for i, card in enumerate(self.hand):
-            print(f"{i:2d}" if card in playable else "  ", f" | {card}")
+            print(f"{i:2d}" if i in choices else "  ", f" | {card}")
+        prompt = "choose index (h for hints): " if self.analyst else "choose index: "
         index = -1
-        while index not in set(
-            i for i, card in enumerate(self.hand) if card in playable
-        ):
+        while index not in choices:
             try:
-                index = int(input("choose index: "))
+                choice = input(prompt)
+                if self.analyst is not None and choice.strip() == "h":
+                    self.print_hints()
+                    continue
+                index = int(choice)
             except Exception:
                 print("invalid")
+        if self.analyst is not None:
+            self.analyst.stop()
         card = self.hand[index]
         return self.hand.play_card(card)
+
+    def print_hints(self) -> None:
+        estimates = self.analyst.estimates()
+        for i, card in enumerate(self.hand):
+            if card in estimates:
+                chance, samples = estimates[card]
+                print(f"{i:2d}  | {str(card):18s} | {chance:6.1%} ({samples} deals)")
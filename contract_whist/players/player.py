@@ -14,12 +14,22 @@ class Player(ABC):
 
     Inheritors must define a method to bid on a hand
     and to play cards.
+
+    Players use __slots__, so inheritors must declare any
+    new attributes in their own __slots__.
     """
+    __slots__ = (
+        "name", "points", "hand", "seat", "table_size", "contract", "trick_count",
+        "cards_seen",
+    )
+
     def __init__(self, name: str):
         self.name: str = name
         self.points: int = 0
 
         self.hand: Hand | None = None
+        self.seat: int | None = None  # position in the bidding order, dealer last
+        self.table_size: int | None = None  # players in the round
         self.contract: int | None = None  # number of tricks to make
         self.trick_count = 0  # current number of tricks in the round
         self.cards_seen: list[Card] = []
@@ -11,6 +11,8 @@ class RandomPlayer(Player):
     Randomly choose from the available options
     """
 
+    __slots__ = ()
+
     def make_bid(self, options: set[int]) -> int:
         return choice(list(options))
 
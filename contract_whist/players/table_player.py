@@ -0,0 +1,32 @@
+from contract_whist.cards import Card
+from contract_whist.hand import Hand
+from contract_whist.players import HeuristicPlayer
+from contract_whist.data.bid_table import BidTable
+
+
+class TablePlayer(HeuristicPlayer):
+    """
+    Plays like the HeuristicPlayer, but bids from the expected
+    tricks in a precomputed `BidTable` whenever the table covers
+    the hand, falling back to the heuristic otherwise.
+    """
+
+    __slots__ = ("table",)
+
+    def __init__(
+        self,
+        name: str,
+        trump_multiplier: float,
+        card_multiplier: float,
+        card_cutoff: int,
+        table: BidTable,
+    ):
+        self.table = table
+        super().__init__(name, trump_multiplier, card_multiplier, card_cutoff)
+
+    def evaluate_hand(self, hand: Hand) -> float:
+        if self.seat is not None:
+            tricks = self.table.lookup(hand, Card.TRUMP, self.seat, self.table_size)
+            if tricks is not None:
+                return tricks
+        return super().evaluate_hand(hand)
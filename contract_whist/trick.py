@@ -12,7 +12,12 @@ class Trick:
     """
     A trick will eventually consist of a card for
     each player once they have all laid.
+
+    A trick can be reset and reused for the next one,
+    rather than allocating a new one each time.
     """
+    __slots__ = ("cards", "players", "lead_suit", "winner")
+
     def __init__(self):
         self.cards: list[Card] = []
         self.players: list[Player] = []
@@ -26,6 +31,15 @@ class Trick:
     def __iter__(self):
         return iter(self.cards)
 
+    def reset(self) -> None:
+        """
+        Clear the trick in place ready for the next one
+        """
+        self.cards.clear()
+        self.players.clear()
+        self.lead_suit = None
+        self.winner = None
+
     def add_card(self, player: Player, card: Card) -> None:
         """
         Add a card to the trick. Need to know